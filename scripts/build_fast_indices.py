@@ -6,47 +6,60 @@ Run once: python build_fast_indices.py
 Generates: /bin/indices.bin
 """
 
+import gzip
+import hashlib
+import json
+import math
+import os
 import pickle
 import sqlite3
-from dataclasses import dataclass
+from array import array
 from pathlib import Path
-from typing import List, Optional
 
 # Import utils directly to avoid circular imports
 from zipsearch.utils import _decode_blob
 
+# Rows pulled from SQLite per fetchmany() call
+FETCH_BATCH_SIZE = 1000
 
-@dataclass
-class FastZipcode:
-    """Local copy of FastZipcode for building indices (avoids circular imports)."""
-    zipcode: str
-    zipcode_type: Optional[str] = None
-    major_city: Optional[str] = None
-    post_office_city: Optional[str] = None
-    common_city_list: Optional[List[str]] = None
-    county: Optional[str] = None
-    state: Optional[str] = None
-    lat: Optional[float] = None
-    lng: Optional[float] = None
-    timezone: Optional[str] = None
-    radius_in_miles: Optional[float] = None
-    area_code_list: Optional[List[str]] = None
-    population: Optional[int] = None
-    population_density: Optional[float] = None
-    land_area_in_sqmi: Optional[float] = None
-    water_area_in_sqmi: Optional[float] = None
-    housing_units: Optional[int] = None
-    occupied_housing_units: Optional[int] = None
-    median_home_value: Optional[int] = None
-    median_household_income: Optional[int] = None
-    bounds_west: Optional[float] = None
-    bounds_east: Optional[float] = None
-    bounds_north: Optional[float] = None
-    bounds_south: Optional[float] = None
-
-
-def build_fast_indices(sqlite_path: str = None):
-    """Build single optimized index file."""
+# gzip level for indices.bin; higher levels cost build time for almost no size gain
+GZIP_LEVEL = 6
+
+# Stored columns, in FastZipcode field order
+FIELDS = (
+    'zipcode', 'zipcode_type', 'major_city', 'post_office_city', 'common_city_list',
+    'county', 'state', 'lat', 'lng', 'timezone', 'radius_in_miles', 'area_code_list',
+    'population', 'population_density', 'land_area_in_sqmi', 'water_area_in_sqmi',
+    'housing_units', 'occupied_housing_units', 'median_home_value',
+    'median_household_income', 'bounds_west', 'bounds_east', 'bounds_north', 'bounds_south',
+)
+
+# Columns normalized in bulk per fetched batch
+CITY_FIELDS = ('major_city', 'post_office_city')
+SHARED_FIELDS = ('zipcode_type', 'county', 'timezone')
+BLOB_FIELDS = ('common_city_list', 'area_code_list')
+
+# Float columns packed as contiguous doubles, with NaN standing in for NULL
+FLOAT_FIELDS = (
+    'lat', 'lng', 'radius_in_miles', 'population_density', 'land_area_in_sqmi',
+    'water_area_in_sqmi', 'bounds_west', 'bounds_east', 'bounds_north', 'bounds_south',
+)
+
+
+def _build_fingerprint(sqlite_path) -> dict:
+    """Identify an indices.bin input: the database contents and this builder's source."""
+    def sha256(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    return {'source_sha256': sha256(sqlite_path), 'builder_sha256': sha256(__file__)}
+
+
+def build_fast_indices(sqlite_path: str = None, force: bool = False):
+    """Build single optimized index file (skipped if its recorded inputs are unchanged unless force)."""
 
     # Find SQLite database
     if sqlite_path is None:
@@ -68,11 +81,41 @@ def build_fast_indices(sqlite_path: str = None):
     # output_dir = Path("bin")
     # output_dir.mkdir(parents=True, exist_ok=True)
 
+    output_file = Path("../zipsearch/bin/indices.bin")
+
+    # Compare content hashes recorded at the last build rather than mtimes, which
+    # a git checkout resets and which miss changes to the builder's output format.
+    # Kept next to this script so the build record never ships as package data.
+    fingerprint_file = Path(__file__).with_name('indices.bin.source.json')
+    fingerprint = {'output': str(output_file.resolve()), **_build_fingerprint(sqlite_path)}
+    if not force and output_file.exists() and fingerprint_file.exists():
+        try:
+            up_to_date = json.loads(fingerprint_file.read_text()) == fingerprint
+        except ValueError:
+            up_to_date = False
+        if up_to_date:
+            print(f"Fast indices up to date: {output_file} (use --force to rebuild)")
+            return
+
     print(f"Building fast indices from {sqlite_path}")
 
     # Load all data from SQLite
     conn = sqlite3.connect(sqlite_path)
+
+    # Rows must stay bare tuples: the batch transpose below is positional over
+    # FIELDS, and a row factory such as sqlite3.Row would add per-row overhead
+    conn.row_factory = None
+
+    # Tune for a single read-only full table scan: memory-mapped reads, a large
+    # page cache and in-memory temp storage
+    conn.executescript("""
+        PRAGMA query_only = 1;
+        PRAGMA mmap_size = 268435456;
+        PRAGMA cache_size = -65536;
+        PRAGMA temp_store = MEMORY;
+    """)
     cursor = conn.cursor()
+    cursor.arraysize = FETCH_BATCH_SIZE
 
     cursor.execute("""
         SELECT zipcode, zipcode_type, major_city, post_office_city, common_city_list,
@@ -83,86 +126,78 @@ def build_fast_indices(sqlite_path: str = None):
         FROM simple_zipcode
     """)
 
-    # Build all indices
-    zipcode_index = {}
-    city_state_index = {}
-    coordinate_grid = {}
-
-    for row in cursor.fetchall():
-        # Unpack all 24 fields
-        (zipcode, zipcode_type, major_city, post_office_city, common_city_list_blob,
-         county, state, lat, lng, timezone, radius_in_miles, area_code_list_blob,
-         population, population_density, land_area_in_sqmi, water_area_in_sqmi,
-         housing_units, occupied_housing_units, median_home_value,
-         median_household_income, bounds_west, bounds_east, bounds_north, bounds_south) = row
-
-        # Create FastZipcode dataclass
-        zipcode_data = FastZipcode(
-            zipcode=zipcode.zfill(5) if zipcode else None,
-            zipcode_type=zipcode_type,
-            major_city=major_city.strip().title() if major_city else None,
-            post_office_city=post_office_city.strip().title() if post_office_city else None,
-            common_city_list=_decode_blob(common_city_list_blob),
-            county=county,
-            state=state.strip().upper() if state else None,
-            lat=lat,
-            lng=lng,
-            timezone=timezone,
-            radius_in_miles=radius_in_miles,
-            area_code_list=_decode_blob(area_code_list_blob),
-            population=population,
-            population_density=population_density,
-            land_area_in_sqmi=land_area_in_sqmi,
-            water_area_in_sqmi=water_area_in_sqmi,
-            housing_units=housing_units,
-            occupied_housing_units=occupied_housing_units,
-            median_home_value=median_home_value,
-            median_household_income=median_household_income,
-            bounds_west=bounds_west,
-            bounds_east=bounds_east,
-            bounds_north=bounds_north,
-            bounds_south=bounds_south
-        )
-
-        # Primary zipcode index
-        if zipcode_data.zipcode:
-            zipcode_index[zipcode_data.zipcode] = zipcode_data.__dict__
-
-        # City/state index
-        if zipcode_data.major_city and zipcode_data.state:
-            key = (zipcode_data.major_city, zipcode_data.state)
-            if key not in city_state_index:
-                city_state_index[key] = []
-            city_state_index[key].append(zipcode_data.__dict__)
-
-        # Spatial grid index
-        if zipcode_data.lat is not None and zipcode_data.lng is not None:
-            lat_grid = int(zipcode_data.lat * 10)
-            lng_grid = int(zipcode_data.lng * 10)
-            grid_key = (lat_grid, lng_grid)
-            if grid_key not in coordinate_grid:
-                coordinate_grid[grid_key] = []
-            coordinate_grid[grid_key].append(zipcode_data.__dict__)
+    # Columnar row storage plus indices of row ids into it
+    columns = {field: [] for field in FIELDS}
+
+    # Repeated strings (states, cities, counties, ...) share one object per
+    # value, so pickle memoizes them and writes each distinct value once
+    strings = {}
+
+    def shared(value):
+        return strings.setdefault(value, value) if value else value
+
+    # Many rows carry identical blobs (area codes especially), so each distinct
+    # blob is decoded once; lists are copied so rows never alias each other
+    blobs = {}
+
+    def decoded(blob):
+        if not blob:
+            return None
+        # Membership, not a None check: blobs that decode to None are cached too
+        if blob not in blobs:
+            blobs[blob] = _decode_blob(blob)
+        value = blobs[blob]
+        return list(value) if isinstance(value, list) else value
+
+    # Stream rows in batches rather than materializing the whole table up front,
+    # and normalize each batch column by column instead of row by row
+    for rows in iter(cursor.fetchmany, []):
+        # Rows without a zipcode can't be looked up and are not stored
+        batch = dict(zip(FIELDS, zip(*[row for row in rows if row[0]])))
+        if not batch:
+            continue
+
+        batch['zipcode'] = [zipcode.zfill(5) for zipcode in batch['zipcode']]
+        batch['state'] = [shared(state.strip().upper()) if state else None for state in batch['state']]
+        for field in CITY_FIELDS:
+            batch[field] = [shared(city.strip().title()) if city else None for city in batch[field]]
+        for field in SHARED_FIELDS:
+            batch[field] = list(map(shared, batch[field]))
+        for field in BLOB_FIELDS:
+            batch[field] = list(map(decoded, batch[field]))
+
+        for field, values in batch.items():
+            columns[field].extend(values)
 
     conn.close()
 
+    # A double array pickles as one raw buffer instead of one tagged object per value
+    for field in FLOAT_FIELDS:
+        columns[field] = array('d', [math.nan if value is None else value for value in columns[field]])
+
     # Save single combined index file
+    # Only the columns are stored; the engine derives its zipcode index,
+    # city/state index and coordinate grid from the records on load.
     all_indices = {
-        'zipcode_index': zipcode_index,
-        'city_state_index': city_state_index,
-        'coordinate_grid': coordinate_grid
+        'zipcode_columns': columns,
     }
 
-    output_file = Path("../zipsearch/bin/indices.bin")
-    with open(output_file, 'wb') as f:
-        pickle.dump(all_indices, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # gzip with a fixed mtime keeps rebuilds of the same data byte-identical;
+    # the engine detects the gzip header and decompresses before unpickling.
+    # Written to a temporary file and swapped in so readers never see a partial file.
+    temp_file = output_file.with_name(output_file.name + '.tmp')
+    temp_file.write_bytes(gzip.compress(pickle.dumps(all_indices, protocol=pickle.HIGHEST_PROTOCOL),
+                                        compresslevel=GZIP_LEVEL, mtime=0))
+    os.replace(temp_file, output_file)
+    fingerprint_file.write_text(json.dumps(fingerprint, indent=2) + '\n')
 
     size_mb = output_file.stat().st_size / (1024 * 1024)
-    print(f"Built fast indices: {len(zipcode_index)} zipcodes, {size_mb:.1f}MB")
+    print(f"Built fast indices: {len(set(columns['zipcode']))} zipcodes, {size_mb:.1f}MB")
     print(f"Saved to: {output_file}")
 
 
 if __name__ == "__main__":
     import sys
-    sqlite_path = sys.argv[1] if len(sys.argv) > 1 else None
-    build_fast_indices(sqlite_path)
\ No newline at end of file
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    sqlite_path = args[0] if args else None
+    build_fast_indices(sqlite_path, force="--force" in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+verify_coordinates.py
+
+Run: python scripts/verify_coordinates.py [--queries N] [--seed S]
+Checks FastSearchEngine.by_coordinates() against a brute-force haversine scan
+of every zipcode and exits non-zero if any result is missing or extra.
+"""
+
+import argparse
+import random
+import sys
+
+from zipsearch import FastSearchEngine
+
+RADII = (1, 5, 10, 25, 50, 100)
+
+# Wide enough for the longitude window to wrap across the antimeridian or span the globe
+LARGE_RADII = (500, 1000, 2500, 4000, 6000, 13000)
+
+# Pacific territories and the Aleutians, on both sides of the antimeridian
+PACIFIC_POINTS = (
+    (13.47, 144.74),    # Guam
+    (15.18, 145.75),    # Saipan, Northern Mariana Islands
+    (-14.28, -170.70),  # Pago Pago, American Samoa
+    (21.31, -157.86),   # Honolulu
+    (51.88, -176.65),   # Adak, Aleutians
+    (52.94, 173.20),    # Attu, Aleutians
+)
+
+# Distances this close to the radius may fall either side depending on formula rounding
+BOUNDARY_TOLERANCE_MILES = 1e-6
+
+
+def brute_force(records, lat, lng, radius):
+    """Return (zipcodes within radius, zipcodes too close to the radius to judge)."""
+    inside, boundary = set(), set()
+    for zc in records:
+        distance = FastSearchEngine._haversine_distance(lat, lng, zc.lat, zc.lng)
+        if abs(distance - radius) <= BOUNDARY_TOLERANCE_MILES:
+            boundary.add(zc.zipcode)
+        elif distance <= radius:
+            inside.add(zc.zipcode)
+    return inside, boundary
+
+
+def query_points(records, count, rng):
+    """Mix of points near real zipcodes, high latitudes, the antimeridian and random spots."""
+    points = [(45.0, -93.0, 25), (64.8, -147.7, 50), (51.9, -176.6, 100), (51.9, 179.9, 100)]
+    points += [(lat, lng, radius) for lat, lng in PACIFIC_POINTS for radius in (100, 4000, 13000)]
+    while len(points) < count:
+        kind = rng.random()
+        radii = RADII
+        if kind < 0.5:
+            zc = rng.choice(records)
+            lat, lng = zc.lat + rng.uniform(-0.3, 0.3), zc.lng + rng.uniform(-0.3, 0.3)
+        elif kind < 0.65:
+            lat, lng = rng.uniform(55.0, 72.0), rng.uniform(-180.0, -130.0)
+        elif kind < 0.8:
+            lat, lng = rng.uniform(18.0, 50.0), rng.uniform(-125.0, -65.0)
+        else:
+            lat, lng = rng.choice(PACIFIC_POINTS)
+            lat, lng = lat + rng.uniform(-2.0, 2.0), (lng + rng.uniform(-5.0, 5.0) + 180.0) % 360.0 - 180.0
+            radii = LARGE_RADII
+        points.append((lat, lng, rng.choice(radii)))
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=200, help='number of random queries')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+
+    engine = FastSearchEngine()
+    records = [zc for zc in engine._indices['zipcode_index'].values()
+               if zc.lat is not None and zc.lng is not None]
+
+    failures = 0
+    for lat, lng, radius in query_points(records, args.queries, random.Random(args.seed)):
+        expected, boundary = brute_force(records, lat, lng, radius)
+        found = {zc.zipcode for zc in engine.by_coordinates(lat, lng, radius)} - boundary
+        if found != expected:
+            failures += 1
+            print(f"by_coordinates({lat:.4f}, {lng:.4f}, {radius}): "
+                  f"missing {sorted(expected - found)}, extra {sorted(found - expected)}")
+
+    print(f"{args.queries} queries checked, {failures} mismatched")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,29 @@
 Fast zipcode lookup with complete backwards compatibility.
 """
 
+import functools
 import math
-import pickle
+import sys
+from array import array
+from dataclasses import fields
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 
 from .FastZipcode import FastZipcode
-from .state_abbr import MAPPER_STATE_ABBR_LONG_TO_SHORT
+from .state_abbr import MAPPER_STATE_ANY_TO_SHORT, MAPPER_STATE_UPPER_TO_SHORT
+from .utils import _read_indices
+
+EARTH_RADIUS_MILES = 3959
+
+# Postings slice for city/state keys with no matches
+_EMPTY_SPAN = slice(0, 0)
+
+# Low-cardinality string fields shared by many records; interned at load time
+_INTERNED_FIELDS = ('zipcode_type', 'major_city', 'post_office_city', 'county', 'state', 'timezone')
+
+# Column names of the stored zipcode data, in FastZipcode field order
+_FIELD_NAMES = tuple(field.name for field in fields(FastZipcode))
 
 
 class FastSearchEngine:
@@ -59,19 +75,177 @@ class FastSearchEngine:
             Maintains same constructor signature as original SearchEngine for
             drop-in compatibility.
         """
+        if data_dir is None:
+            data_dir = Path(__file__).parent / "bin"
+
+        self.data_dir = Path(data_dir)
+        self._indices = None
+        self._records = None
+        self._zipcode_table = None
+        self._city_state_postings = None
+        self._state_index = None
+        self._prefix_index = None
+        self._load_indices()
 
     def _load_indices(self) -> None:
         """
-        Load all pre-built indices into memory for fast lookups.
+        Load the zipcode index into memory for fast lookups.
 
         This is a one-time initialization cost that loads:
         - Zipcode index: Direct zipcode → data mapping
+
+        The secondary indices are derived from the same records on first use,
+        so processes that only call by_zipcode() never pay for them:
         - City/state index: (city, state) → list of zipcodes
         - Coordinate grid: Spatial grid for radius searches
+        - State and prefix buckets
 
         Raises:
             FileNotFoundError: If indices.bin file is missing.
         """
+        try:
+            # Read the file in one call, decompress if needed and unpickle from memory
+            raw_indices = _read_indices(self.data_dir / 'indices.bin')
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Fast indices not found in {self.data_dir}. "
+                f"Run build_fast_indices.py first."
+            )
+
+        columns = raw_indices.get('zipcode_columns')
+        if columns is None:
+            # Row-oriented files store one dict per zipcode; read them column-wise
+            rows = raw_indices['zipcode_index'].values()
+            columns = {name: [row[name] for row in rows] for name in _FIELD_NAMES}
+
+        # Packed float columns use NaN for missing values
+        for name, column in columns.items():
+            if isinstance(column, array):
+                columns[name] = [value if value == value else None for value in column]
+
+        # Repeated city/state/county strings collapse to a single copy
+        intern = sys.intern
+        for name in _INTERNED_FIELDS:
+            columns[name] = [intern(value) if value is not None else None for value in columns[name]]
+
+        # Rehydrate each row once, positionally in field order; the file's secondary
+        # indices are rebuilt from these records, in file order, on demand.
+        self._records = tuple(map(FastZipcode, *(columns[name] for name in _FIELD_NAMES)))
+        zipcode_index = {zc.zipcode: zc for zc in sorted(self._records, key=lambda zc: zc.zipcode)}
+
+        # Zipcodes are 5-digit integers, so a table over 00000-99999 indexed by
+        # int(zipcode) is a collision-free perfect hash for integer lookups.
+        self._zipcode_table = [None] * 100000
+        for zipcode, zipcode_data in zipcode_index.items():
+            self._zipcode_table[int(zipcode)] = zipcode_data
+
+        self._indices = {'zipcode_index': zipcode_index}
+
+    def _city_state_index(self) -> Tuple[Dict[Tuple[str, str], slice], List[FastZipcode]]:
+        """
+        Return the city/state index and its postings, building them on first use.
+
+        City/state matches live in one flat postings list; the index maps each
+        key to its slice of it. City keys are case-folded once here so queries
+        only need one casefold(). Key strings are interned so tuple equality
+        against the canonical state abbreviations short-circuits on identity.
+
+        Returns:
+            Tuple[Dict[Tuple[str, str], slice], List[FastZipcode]]: Mapping from
+                (casefolded city, state) to a postings slice, and the postings.
+        """
+        city_state_index = self._indices.get('city_state_index')
+        if city_state_index is None:
+            intern = sys.intern
+            grouped = {}
+            for zc in self._records:
+                if zc.major_city and zc.state:
+                    grouped.setdefault((zc.major_city, zc.state), []).append(zc)
+
+            postings = []
+            city_state_index = {}
+            for (city, state), zipcodes in grouped.items():
+                start = len(postings)
+                postings.extend(zipcodes)
+                city_state_index[(intern(city.casefold()), state)] = slice(start, len(postings))
+
+            self._city_state_postings = postings
+            self._indices['city_state_index'] = city_state_index
+        return city_state_index, self._city_state_postings
+
+    def _coordinate_grid(self) -> Dict[Tuple[int, int], Tuple[tuple, tuple, tuple, tuple]]:
+        """
+        Return the coordinate grid, building it on first use.
+
+        Returns:
+            Dict[Tuple[int, int], Tuple[tuple, tuple, tuple, tuple]]: Mapping from 0.1 degree
+                (lat, lng) cell to that cell's column tuples (see _grid_cell()).
+        """
+        coordinate_grid = self._indices.get('coordinate_grid')
+        if coordinate_grid is None:
+            cells = {}
+            for zc in self._records:
+                if zc.lat is not None and zc.lng is not None:
+                    cells.setdefault((int(zc.lat * 10), int(zc.lng * 10)), []).append(zc)
+
+            coordinate_grid = {key: self._grid_cell(zipcodes) for key, zipcodes in cells.items()}
+            self._indices['coordinate_grid'] = coordinate_grid
+        return coordinate_grid
+
+    def _state_buckets(self) -> Dict[str, Tuple[FastZipcode, ...]]:
+        """
+        Return per-state zipcode tuples, building them on first use.
+
+        Buckets follow city/state index order so by_state() copies one tuple
+        instead of scanning.
+        """
+        if self._state_index is None:
+            city_state_index, postings = self._city_state_index()
+            state_index = {}
+            for (city_key, state_key), span in city_state_index.items():
+                state_index.setdefault(state_key, []).extend(postings[span])
+            self._state_index = {state: tuple(zipcodes) for state, zipcodes in state_index.items()}
+        return self._state_index
+
+    def _prefix_buckets(self) -> Dict[str, Tuple[FastZipcode, ...]]:
+        """
+        Return zipcode tuples for every 0-4 character prefix, building them on first use.
+
+        Buckets are filled in zipcode order so by_prefix() needs neither a scan
+        nor a sort; 5+ character prefixes are exact lookups.
+        """
+        if self._prefix_index is None:
+            prefix_index = {}
+            for zipcode, zipcode_data in self._indices['zipcode_index'].items():
+                for length in range(5):
+                    prefix_index.setdefault(zipcode[:length], []).append(zipcode_data)
+            self._prefix_index = {prefix: tuple(zipcodes) for prefix, zipcodes in prefix_index.items()}
+        return self._prefix_index
+
+    @staticmethod
+    def _grid_cell(zipcodes: List[FastZipcode]) -> Tuple[tuple, tuple, tuple, tuple]:
+        """
+        Lay out one coordinate grid cell as parallel column tuples.
+
+        Records without coordinates can never match a radius search, so they
+        are dropped here rather than filtered on every query. Coordinates are
+        stored in radians alongside the latitude cosine, so the distance pass
+        does no per-candidate conversion.
+
+        Args:
+            zipcodes (List[FastZipcode]): Zipcode objects falling in the cell.
+
+        Returns:
+            Tuple[tuple, tuple, tuple, tuple]: Records, latitudes and longitudes in
+                                               radians, and latitude cosines,
+                                               position-aligned.
+        """
+        located = [zc for zc in zipcodes if zc.lat is not None and zc.lng is not None]
+        lat_rads = tuple(math.radians(zc.lat) for zc in located)
+        return (tuple(located),
+                lat_rads,
+                tuple(math.radians(zc.lng) for zc in located),
+                tuple(map(math.cos, lat_rads)))
 
     def _normalize_state(self, state: str) -> str:
         """
@@ -91,6 +265,14 @@ class FastSearchEngine:
             >>> engine._normalize_state("New York")
             'NY'
         """
+        # Common spellings resolve as given; anything else is cleaned and probed once
+        # more, covering both abbreviations and full names. Unknown values pass through.
+        state_norm = MAPPER_STATE_ANY_TO_SHORT.get(state)
+        if state_norm is not None:
+            return state_norm
+
+        state_clean = state.strip().upper()
+        return MAPPER_STATE_UPPER_TO_SHORT.get(state_clean, state_clean)
 
     def by_zipcode(self, zipcode: Union[str, int]) -> Optional[FastZipcode]:
         """
@@ -117,6 +299,18 @@ class FastSearchEngine:
             >>> # Works with integers too
             >>> zip_data = engine.by_zipcode(90210)
         """
+        if type(zipcode) is int:
+            return self._zipcode_table[zipcode] if 0 <= zipcode < 100000 else None
+
+        # Well-formed 5-digit strings hit the index directly with no new string
+        zipcode_index = self._indices['zipcode_index']
+        if type(zipcode) is str:
+            zipcode_data = zipcode_index.get(zipcode)
+            if zipcode_data is not None:
+                return zipcode_data
+
+        normalized = str(zipcode).zfill(5)
+        return zipcode_index.get(normalized)
 
     def by_city_and_state(self, city: str, state: str) -> List[FastZipcode]:
         """
@@ -126,7 +320,7 @@ class FastSearchEngine:
         Handles both state abbreviations ("CA") and full names ("California").
 
         Args:
-            city (str): City name (case-insensitive, auto-title-cased)
+            city (str): City name (case-insensitive)
             state (str): State abbreviation or full name (e.g., "CA", "California")
 
         Returns:
@@ -144,6 +338,13 @@ class FastSearchEngine:
             >>> # Works with full state names
             >>> zipcodes = engine.by_city_and_state("Beverly Hills", "California")
         """
+        city_norm = city.strip().casefold()
+        state_norm = self._normalize_state(state)
+
+        city_state_index, postings = self._city_state_index()
+
+        key = (city_norm, state_norm)
+        return postings[city_state_index.get(key, _EMPTY_SPAN)]
 
     def by_coordinates(self, lat: float, lng: float, radius: float = 25.0) -> List[FastZipcode]:
         """
@@ -171,6 +372,56 @@ class FastSearchEngine:
             '90211: Beverly Hills'
             '90212: Beverly Hills'
         """
+        if radius < 0:
+            return []
+
+        # Search window in degrees. A degree of latitude is a fixed distance, but a
+        # degree of longitude shrinks with cos(latitude), so the longitude span is
+        # sized at the window's latitude farthest from the equator; near the poles
+        # it covers every longitude.
+        lat_span = math.degrees(radius / EARTH_RADIUS_MILES)
+        cos_edge = math.cos(math.radians(min(abs(lat) + lat_span, 90.0)))
+        lng_span = min(lat_span / cos_edge, 180.0) if cos_edge > 1e-9 else 180.0
+
+        # Grid cells are int(degrees * 10), which is monotonic, so the cells of a
+        # degree range are exactly those between the cells of its endpoints.
+        # Windows crossing the antimeridian wrap onto the other side, and a
+        # window at least 360 degrees wide covers every longitude.
+        lat_cells = range(int(max(lat - lat_span, -90.0) * 10), int(min(lat + lat_span, 90.0) * 10) + 1)
+        if lng_span >= 180.0:
+            lng_ranges = [(-180.0, 180.0)]
+        else:
+            lng_ranges = [(max(lng - lng_span, -180.0), min(lng + lng_span, 180.0))]
+            if lng + lng_span > 180.0:
+                lng_ranges.append((-180.0, lng + lng_span - 360.0))
+            if lng - lng_span < -180.0:
+                lng_ranges.append((lng - lng_span + 360.0, 180.0))
+        lng_cells = [lng_cell
+                     for lng_low, lng_high in lng_ranges
+                     for lng_cell in range(int(lng_low * 10), int(lng_high * 10) + 1)]
+
+        # Cells are stored column-wise, so neighbouring cells concatenate into
+        # one set of candidate columns without touching the records themselves;
+        # a lone non-empty cell is used as-is with no concatenation at all
+        coordinate_grid = self._coordinate_grid()
+        cells = [cell for cell in map(coordinate_grid.get, [(lat_cell, lng_cell)
+                                                            for lat_cell in lat_cells
+                                                            for lng_cell in lng_cells])
+                 if cell is not None]
+        if not cells:
+            return []
+        if len(cells) == 1:
+            candidates, lat_rads, lng_rads, cos_lats = cells[0]
+        else:
+            candidates, lat_rads, lng_rads, cos_lats = (list(chain.from_iterable(column))
+                                                        for column in zip(*cells))
+
+        # Filter by actual distance, computed for all candidates in one pass, and sort
+        results = [(distance, candidates[position])
+                   for distance, position in self._haversine_within(lat, lng, lat_rads, lng_rads, cos_lats, radius)]
+
+        results.sort(key=lambda x: x[0])
+        return [zipcode_data for _, zipcode_data in results]
 
     def by_city(self, city: str) -> List[FastZipcode]:
         """
@@ -193,6 +444,13 @@ class FastSearchEngine:
             >>> print(sorted(states))
             ['IL', 'MA', 'MO', 'OH', ...]
         """
+        city_norm = city.strip().casefold()
+        city_state_index, postings = self._city_state_index()
+        results = []
+        for (city_key, state_key), span in city_state_index.items():
+            if city_key == city_norm:
+                results.extend(postings[span])
+        return results
 
     def by_state(self, state: str) -> List[FastZipcode]:
         """
@@ -217,6 +475,7 @@ class FastSearchEngine:
             >>> print(f"California has {len(ca_zipcodes)} zipcodes")
             'California has 2634 zipcodes'
         """
+        return list(self._state_buckets().get(self._normalize_state(state), ()))
 
     def by_prefix(self, prefix: str) -> List[FastZipcode]:
         """
@@ -243,6 +502,12 @@ class FastSearchEngine:
             '90211: Beverly Hills'
             '90212: Beverly Hills'
         """
+        prefix_str = str(prefix)
+        if len(prefix_str) < 5:
+            return list(self._prefix_buckets().get(prefix_str, ()))
+
+        zipcode_data = self._indices['zipcode_index'].get(prefix_str)
+        return [zipcode_data] if zipcode_data is not None else []
 
     def batch_city_state_lookup(self, city_state_pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[FastZipcode]]:
         """
@@ -269,6 +534,66 @@ class FastSearchEngine:
             'Manhattan, NY: 34 zipcodes'
             'Miami, FL: 28 zipcodes'
         """
+        city_state_index, postings = self._city_state_index()
+        normalize_state = self._normalize_state
+
+        # Repeated inputs are resolved once; states are normalized once per distinct value
+        states = {}
+        results = {}
+        for city, state in city_state_pairs:
+            key = (city, state)
+            if key in results:
+                continue
+
+            state_norm = states.get(state)
+            if state_norm is None:
+                state_norm = states[state] = normalize_state(state)
+
+            results[key] = postings[city_state_index.get((city.strip().casefold(), state_norm), _EMPTY_SPAN)]
+        return results
+
+    def batch_zipcode_lookup(self, zipcodes: List[Union[str, int]]) -> Dict[Union[str, int], Optional[FastZipcode]]:
+        """
+        Perform batch lookup for multiple zipcodes.
+
+        Counterpart of batch_city_state_lookup() for exact zipcode lookups.
+        Resolves the whole batch in a single call, avoiding per-lookup method
+        dispatch when enriching large datasets.
+
+        Args:
+            zipcodes (List[Union[str, int]]): List of zipcodes to look up
+                                              simultaneously.
+
+        Returns:
+            Dict[Union[str, int], Optional[FastZipcode]]: Mapping from input zipcodes
+                                                          to their zipcode objects,
+                                                          or None if not found.
+
+        Examples:
+            >>> engine = FastSearchEngine()
+            >>> results = engine.batch_zipcode_lookup(["90210", "10001", 60601])
+            >>> for zipcode, zip_data in results.items():
+            ...     print(f"{zipcode}: {zip_data.city}")
+            '90210: Beverly Hills'
+            '10001: New York'
+            '60601: Chicago'
+        """
+        # Resolve well-formed str and int inputs inline; anything else, or a
+        # str miss that may still need zero-padding, goes through by_zipcode()
+        get_zipcode = self._indices['zipcode_index'].get
+        zipcode_table = self._zipcode_table
+        by_zipcode = self.by_zipcode
+        results = {}
+        for zipcode in zipcodes:
+            kind = type(zipcode)
+            if kind is str:
+                zipcode_data = get_zipcode(zipcode)
+                results[zipcode] = zipcode_data if zipcode_data is not None else by_zipcode(zipcode)
+            elif kind is int and 0 <= zipcode < 100000:
+                results[zipcode] = zipcode_table[zipcode]
+            else:
+                results[zipcode] = by_zipcode(zipcode)
+        return results
 
     @staticmethod
     def _haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
@@ -296,6 +621,64 @@ class FastSearchEngine:
             >>> print(f"{dist:.1f} miles")
             '6.2 miles'
         """
+        R = EARTH_RADIUS_MILES
+
+        dlat = math.radians(lat2 - lat1)
+        dlng = math.radians(lng2 - lng1)
+
+        a = (math.sin(dlat/2)**2 +
+             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng/2)**2)
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+
+        return R * c
+
+    @staticmethod
+    def _haversine_within(lat: float, lng: float, lat_rads: List[float], lng_rads: List[float],
+                          cos_lats: List[float], radius: float) -> List[Tuple[float, int]]:
+        """
+        Find which target points lie within a radius of one origin point.
+
+        Batched form of _haversine_distance() for radius searches: targets come
+        pre-converted to radians with their latitude cosines, the origin's are
+        computed once, and the math functions are bound locally. Candidates
+        are filtered on the haversine term itself against sin²(radius / 2R),
+        so sqrt() and asin() only run for points that match.
+
+        Args:
+            lat (float): Latitude of the origin in decimal degrees
+            lng (float): Longitude of the origin in decimal degrees
+            lat_rads (List[float]): Latitudes of the target points in radians
+            lng_rads (List[float]): Longitudes of the target points in radians
+            cos_lats (List[float]): Cosines of the target latitudes
+            radius (float): Search radius in miles
+
+        Returns:
+            List[Tuple[float, int]]: (distance in miles, input position) for each
+                                     target point within radius, in input order.
+        """
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+
+        lat1 = math.radians(lat)
+        lng1 = math.radians(lng)
+        cos_lat1 = math.cos(lat1)
+        diameter = 2 * EARTH_RADIUS_MILES
+
+        # Distance grows monotonically with the haversine term up to half the
+        # globe, so comparing the term is equivalent to comparing the distance
+        half_angle = radius / diameter
+        if half_angle < 0:
+            return []
+        threshold = sin(half_angle) ** 2 if half_angle < math.pi / 2 else 1.0
+
+        haversines = [
+            sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos_lat2 * sin((lng2 - lng1) / 2) ** 2
+            for lat2, lng2, cos_lat2 in zip(lat_rads, lng_rads, cos_lats)
+        ]
+        return [
+            (diameter * asin(min(1.0, sqrt(a))), position)
+            for position, a in enumerate(haversines)
+            if a <= threshold
+        ]
 
     def close(self):
         """
@@ -304,4 +687,37 @@ class FastSearchEngine:
         Backwards compatibility method for drop-in replacement.
         The FastSearchEngine doesn't maintain open connections,
         so this is effectively a no-op but maintains API compatibility.
-        """
\ No newline at end of file
+        """
+        pass
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_engine(data_dir: Path) -> FastSearchEngine:
+    """Return the engine for an already resolved data directory, building it once."""
+    return FastSearchEngine(data_dir)
+
+
+def get_engine(data_dir: Optional[str] = None) -> FastSearchEngine:
+    """
+    Return a shared FastSearchEngine, loading its indices only once.
+
+    Loading indices.bin is the dominant cost of constructing an engine, and
+    an engine is read-only once loaded, so callers that would otherwise
+    construct their own can share one instance per data directory.
+
+    Args:
+        data_dir (str, optional): Path to directory containing indices.bin file.
+                                Defaults to package's bin directory.
+
+    Returns:
+        FastSearchEngine: The engine cached for data_dir.
+
+    Examples:
+        >>> engine = get_engine()
+        >>> engine is get_engine()
+        True
+    """
+    # Resolve first so None, relative and absolute spellings of one directory share an entry
+    if data_dir is None:
+        data_dir = Path(__file__).parent / "bin"
+    return _cached_engine(Path(data_dir).resolve())
@@ -3,9 +3,9 @@ from typing import Dict, List, Optional
 
 
 # noinspection PyUnusedName
-@dataclass
+@dataclass(slots=True)
 class FastZipcode:
-    """Complete zipcode data matching SQLite schema."""
+    """Complete zipcode data matching SQLite schema (slotted: one shared instance per zipcode)."""
     zipcode: str
     zipcode_type: Optional[str] = None
     major_city: Optional[str] = None
@@ -1,5 +1,5 @@
 # Import actual fast classes for direct access
-from .FastSearchEngine import FastSearchEngine
+from .FastSearchEngine import FastSearchEngine, get_engine
 from .FastZipcode import FastZipcode
 
 # Import backwards compatible classes
@@ -22,5 +22,6 @@ __all__ = [
     'DEFAULT_LIMIT',
     'FastSearchEngine',    # Direct access to fast version
     'FastZipcode',         # Direct access to fast dataclass
+    'get_engine',          # Shared, load-once FastSearchEngine
 ]
 
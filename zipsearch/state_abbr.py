@@ -58,4 +58,18 @@ MAPPER_STATE_ABBR_SHORT_TO_LONG = {
 MAPPER_STATE_ABBR_LONG_TO_SHORT = {
     long: short
     for short, long in MAPPER_STATE_ABBR_SHORT_TO_LONG.items()
-}
\ No newline at end of file
+}
+
+# Upper-cased state names and abbreviations -> abbreviation, for single-probe normalization
+MAPPER_STATE_UPPER_TO_SHORT = {
+    **{short: short for short in MAPPER_STATE_ABBR_SHORT_TO_LONG},
+    **{long.upper(): short for short, long in MAPPER_STATE_ABBR_SHORT_TO_LONG.items()},
+}
+
+# Common spellings as typed (CA, ca, Ca, California, CALIFORNIA, california) -> abbreviation,
+# so already-clean input normalizes with one probe and no string copies
+MAPPER_STATE_ANY_TO_SHORT = {
+    spelling: short
+    for short, long in MAPPER_STATE_ABBR_SHORT_TO_LONG.items()
+    for spelling in (short, short.lower(), short.title(), long, long.upper(), long.lower(), long.title())
+}
@@ -1,5 +1,8 @@
+import gzip
 import json
-from typing import Optional, List
+import pickle
+from pathlib import Path
+from typing import Any, List, Optional, Union
 
 
 def _decode_blob(blob_data: bytes) -> Optional[List[str]]:
@@ -14,3 +17,15 @@ def _decode_blob(blob_data: bytes) -> Optional[List[str]]:
         return json.loads(decompressed.decode('utf-8'))
     except:
         return None
+
+
+# Leading bytes of a gzip stream; plain pickles start with the PROTO opcode instead
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _read_indices(path: Union[str, Path]) -> Any:
+    """Read an indices.bin file (gzip-compressed or plain pickle)."""
+    data = Path(path).read_bytes()
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    return pickle.loads(data)